@@ -176,6 +176,7 @@ class Pipeline:
 
             print(f"Completed processing for image: {image_name}")
 
+        self.image_visualization.close()
         print("\nPipeline execution completed!")
         print("=" * 50)
 
@@ -19,6 +19,7 @@ from nipype.interfaces.fsl import FLIRT
 
 from src.utils import helper_functions as hf
 from src.utils.helper_functions import (
+    cache_per_file_version,
     convert_nii_gz_to_nii,
     nib_to_sitk,
     prepare_output_directory,
@@ -26,6 +27,12 @@ from src.utils.helper_functions import (
 )
 
 
+@cache_per_file_version(maxsize=4)
+def _load_sitk_template(template_path: str):
+    """Reads a registration template as a SimpleITK image, cached per file version."""
+    return nib_to_sitk(nib.load(template_path))
+
+
 class Registration:
     """
     The main class for performing image registration.
@@ -246,8 +253,7 @@ class Registration:
     def sitk_registration(self, image: nib.Nifti1Image, template: str) -> nib.Nifti1Image:
         """Register the moving image to the fixed image using SimpleITK."""
         sitk_config = self.config["methods"]["sitk"]
-        template_nib = nib.load(template)
-        template_sitk = nib_to_sitk(template_nib)
+        template_sitk = _load_sitk_template(template)
         try:
             moving_img = nib.as_closest_canonical(image)
             moving_img = nib_to_sitk(moving_img)
@@ -11,11 +11,32 @@ import itk
 import nibabel as nib
 import numpy as np
 import SimpleITK as sitk
-from nipype.interfaces.ants import ResampleImageBySpacing
 from scipy.ndimage import zoom
 
 from src.utils import helper_functions as hf
 
+# Interpolators used by the SimpleITK resampling filter
+SITK_INTERP_MAP = {
+    "linear": sitk.sitkLinear,
+    "bspline": sitk.sitkBSpline,
+    "nearest_neighbor": sitk.sitkNearestNeighbor,
+}
+
+# Interpolation modes expected by torch.nn.functional.interpolate on 3D volumes
+TORCH_INTERP_MAP = {
+    "linear": "trilinear",
+    "nearest_neighbor": "nearest",
+}
+
+# Interpolator codes expected by ants.resample_image
+ANTS_INTERP_MAP = {
+    "linear": 0,
+    "nearest_neighbor": 1,
+    "gaussian": 2,
+    "windowed_sinc": 3,
+    "bspline": 4,
+}
+
 
 class Resampling:
     """
@@ -32,9 +53,11 @@ class Resampling:
         Resamples the given image using the enabled resampling methods and
         saves the results to the specified path.
     resample_with_ants(image, spacing)
-        Resamples the given image using ANTs.
+        Resamples the given image in-process using ANTsPy.
     resample_with_scipy(image, spacing)
         Resamples the given image using SciPy.
+    resample_with_torch(image, spacing)
+        Resamples the given image on the GPU using PyTorch.
     """
 
     def __init__(self, config: dict):
@@ -52,6 +75,7 @@ class Resampling:
             "scipy": self.resample_with_scipy,
             "sitk": self.resample_with_sitk,
             "itk": self.resample_with_itk,
+            "torch": self.resample_with_torch,
         }
 
     def run(self, image, image_path: str):
@@ -81,31 +105,41 @@ class Resampling:
                     nib.save(resampled_image, filename)
                 return resampled_image
 
-    def resample_with_ants(self, image, spacing):
+    def resample_with_ants(self, image: nib.Nifti1Image, spacing: tuple) -> nib.Nifti1Image:
         """
-        Resamples the given image using ANTs.
+        Resamples the given image in-process using the ANTsPy API.
+
+        ANTs reads ITK_GLOBAL_DEFAULT_NUMBER_OF_THREADS only when it is first
+        imported, so the variable has to be exported before the pipeline starts.
 
         Parameters
         ----------
-        image : numpy.ndarray
+        image : nib.Nifti1Image
             The image to resample.
         spacing : tuple
             The target voxel spacing.
 
         Returns
         -------
-        numpy.ndarray
+        nib.Nifti1Image
             The resampled image.
         """
-        resampler = ResampleImageBySpacing()
-        resampler.inputs.input_image = nib.Nifti1Image(image, np.eye(4))
-        resampler.inputs.output_image = "output.nii.gz"
-        resampler.inputs.output_image_dtype = "float32"
-        resampler.inputs.spacing = spacing
-        resampler.run()
-        resampled_image = nib.load("output.nii.gz").get_fdata()
-        os.remove("output.nii.gz")
-        return resampled_image
+        import ants
+
+        config = self.config["methods"]["ants"]
+        interp_type = ANTS_INTERP_MAP[config.get("interpolation", "linear")]
+
+        ants_image = ants.from_numpy(
+            image.get_fdata(dtype=np.float32),
+            spacing=tuple(float(size) for size in image.header.get_zooms()[:3]),
+        )
+        resampled = ants.resample_image(
+            ants_image, spacing, use_voxels=False, interp_type=interp_type
+        )
+
+        new_affine = image.affine.copy()
+        new_affine[:3, :3] = np.diag(spacing)
+        return nib.Nifti1Image(resampled.numpy(), new_affine)
 
     def resample_with_scipy(self, image: nib.Nifti1Image, spacing: tuple) -> np.ndarray:
         """
@@ -128,14 +162,21 @@ class Resampling:
             preserve_range = config.get("preserve_range", True)
 
             # Calculate zoom factors
-            img_data = image.get_fdata()
             current_spacing = np.array(image.header.get_zooms()[:3])
             scale_factors = current_spacing / np.array(spacing)
+
+            # zoom is not an identity for unit factors, so skip it entirely
+            if np.allclose(scale_factors, 1.0):
+                return image
+
+            # Interpolate in float32 rather than float64 to halve the working set
+            img_data = np.asarray(image.dataobj, dtype=np.float32)
             
             # Apply resampling
             resampled = zoom(
                 img_data,
                 scale_factors,
+                output=np.float32,
                 order=order,
                 mode=mode,
                 prefilter=True,
@@ -144,7 +185,10 @@ class Resampling:
             
             if preserve_range:
                 # Ensure output intensity range matches input
-                resampled = np.clip(resampled, img_data.min(), img_data.max())
+                np.clip(resampled, img_data.min(), img_data.max(), out=resampled)
+
+            # Release the source volume before building the output image
+            del img_data
                 
             new_affine = image.affine.copy()
             new_affine[:3, :3] = np.diag(spacing)
@@ -169,50 +213,39 @@ class Resampling:
         nib.Nifti1Image
             Resampled image
         """
-        try:
-            config = self.config["methods"]["sitk"]
-            interp_type = config.get("interpolation", "linear")
-            spacing = config.get("spacing", [1.0, 1.0, 1.0])
+        config = self.config["methods"]["sitk"]
+        interpolator = SITK_INTERP_MAP[config.get("interpolation", "linear")]
+        spacing = config.get("spacing", [1.0, 1.0, 1.0])
 
-            # Convert to SimpleITK
-            sitk_image = hf.nib_to_sitk(image)
-            # Calculate new size
-            old_size = sitk_image.GetSize()
-            old_spacing = sitk_image.GetSpacing()
-            new_spacing = tuple(spacing)
-            new_size = [
-                int(round((old_size[0] * old_spacing[0]) / float(new_spacing[0]))),
-                int(round((old_size[1] * old_spacing[1]) / float(new_spacing[1]))),
-                int(round((old_size[2] * old_spacing[2]) / float(new_spacing[2]))),
-            ]
-            # Set interpolator
-            interpolator_map = {
-                "linear": sitk.sitkLinear,
-                "bspline": sitk.sitkBSpline,
-                "nearest_neighbor": sitk.sitkNearestNeighbor
-            }
-            interpolator = interpolator_map.get(interp_type, sitk.sitkLinear)
-
-
-            # Configure resampler
-            resampler = sitk.ResampleImageFilter()
-            resampler.SetOutputSpacing(new_spacing)
-            resampler.SetSize(new_size)
-            resampler.SetDefaultPixelValue(sitk_image.GetPixelIDValue())
-            resampler.SetOutputPixelType(sitk.sitkFloat32)
-            resampler.SetInterpolator(interpolator)
-            resampler.SetOutputDirection(sitk_image.GetDirection())
-            resampler.SetOutputOrigin(sitk_image.GetOrigin())
+        # Nothing to resample if the image is already on the target grid
+        if np.allclose(image.header.get_zooms()[:3], spacing):
+            return image
 
-            # Execute resampling
-            resampled_img = resampler.Execute(sitk_image)
-            
-            # Convert back to Nibabel
-            return hf.sitk_to_nib(resampled_img)
-            
-        except Exception as e:
-            print(f"Exception thrown while setting up the resampling filter: {e}")
-            raise Exception(f"Error in SimpleITK resampling: {str(e)}")
+        # Convert to SimpleITK
+        sitk_image = hf.nib_to_sitk(image)
+        # Calculate new size
+        old_size = sitk_image.GetSize()
+        old_spacing = sitk_image.GetSpacing()
+        new_spacing = tuple(spacing)
+        new_size = [
+            int(round((old_size[0] * old_spacing[0]) / float(new_spacing[0]))),
+            int(round((old_size[1] * old_spacing[1]) / float(new_spacing[1]))),
+            int(round((old_size[2] * old_spacing[2]) / float(new_spacing[2]))),
+        ]
+
+        # Configure resampler
+        resampler = sitk.ResampleImageFilter()
+        resampler.SetOutputSpacing(new_spacing)
+        resampler.SetSize(new_size)
+        resampler.SetDefaultPixelValue(sitk_image.GetPixelIDValue())
+        resampler.SetOutputPixelType(sitk.sitkFloat32)
+        resampler.SetInterpolator(interpolator)
+        resampler.SetOutputDirection(sitk_image.GetDirection())
+        resampler.SetOutputOrigin(sitk_image.GetOrigin())
+
+        # Execute resampling and convert back to Nibabel
+        resampled_img = resampler.Execute(sitk_image)
+        return hf.sitk_to_nib(resampled_img)
 
     def resample_with_itk(self, image: nib.Nifti1Image, spacing: tuple) -> nib.Nifti1Image:
         """
@@ -279,3 +312,50 @@ class Resampling:
 
         except Exception as e:
             raise Exception(f"Error in ITK resampling: {str(e)}")
+
+    def resample_with_torch(self, image: nib.Nifti1Image, spacing: tuple) -> nib.Nifti1Image:
+        """
+        Resamples image with PyTorch, on the GPU when one is available.
+
+        Linear interpolation uses aligned corners, which matches the grid used by
+        the SciPy variant (``grid_mode=False``).
+
+        Parameters
+        ----------
+        image : nib.Nifti1Image
+            Input image
+        spacing : tuple
+            Target spacing
+
+        Returns
+        -------
+        nib.Nifti1Image
+            Resampled image
+        """
+        import torch
+        import torch.nn.functional as F
+
+        config = self.config["methods"]["torch"]
+        mode = TORCH_INTERP_MAP[config.get("interpolation", "linear")]
+        device = config.get("device", "cuda")
+        if device == "cuda" and not torch.cuda.is_available():
+            device = "cpu"
+
+        old_spacing = np.array(image.header.get_zooms()[:3])
+        new_size = [
+            int(round(image.shape[i] * old_spacing[i] / spacing[i])) for i in range(3)
+        ]
+
+        volume = torch.as_tensor(image.get_fdata(dtype=np.float32), device=device)
+        with torch.no_grad():
+            resampled = F.interpolate(
+                volume[None, None],
+                size=new_size,
+                mode=mode,
+                align_corners=True if mode == "trilinear" else None,
+            )
+        resampled = resampled[0, 0].cpu().numpy()
+
+        new_affine = image.affine.copy()
+        new_affine[:3, :3] = np.diag(spacing)
+        return nib.Nifti1Image(resampled, new_affine)
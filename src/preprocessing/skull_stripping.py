@@ -1,5 +1,16 @@
+import numpy as np
 import SimpleITK as sitk
 
+from src.utils.helper_functions import cache_per_file_version
+
+# Number of slices compared at once in threshold skull stripping
+THRESHOLD_BLOCK = 64
+
+
+@cache_per_file_version(maxsize=2)
+def _load_atlas(atlas_path: str):
+    """Reads the skull-stripping atlas once per file version for the whole process."""
+    return sitk.ReadImage(atlas_path, sitk.sitkFloat32)
 
 
 class SkullStripping:
@@ -22,8 +33,16 @@ class SkullStripping:
         # Get parameters from config
         threshold = self.config['threshold']['value']
 
-        # Perform threshold-based skull stripping
-        stripped = image > threshold
+        # Perform threshold-based skull stripping on a view of the voxel buffer
+        voxels = sitk.GetArrayViewFromImage(image)
+        mask = np.empty(voxels.shape, dtype=np.uint8)
+        # Compare in slabs of slices to bound the working set of each pass
+        for start in range(0, voxels.shape[0], THRESHOLD_BLOCK):
+            stop = start + THRESHOLD_BLOCK
+            np.greater(voxels[start:stop], threshold, out=mask[start:stop])
+
+        stripped = sitk.GetImageFromArray(mask)
+        stripped.CopyInformation(image)
         return stripped
 
     def morphological_skull_stripping(self, image, path):
@@ -34,11 +53,10 @@ class SkullStripping:
         return stripped
 
     def atlas_skull_stripping(self, image, path):
-        # Get parameters from config
+        # The atlas is the same for every subject, the pipeline builds a new
+        # step per image so the read is cached at module level
         atlas_path = self.config['atlas']['path']
-
-        # Load atlas
-        atlas = sitk.ReadImage(atlas_path)
+        atlas = _load_atlas(atlas_path)
 
         # Register atlas to subject's image
         # Note: registration is a complex task and this is a simplified example
@@ -18,19 +18,22 @@ class SliceTimingCorrection:
         if not os.path.exists(image):
             raise FileNotFoundError(f"No file found at {image}")
 
-        # Load the image
-        img = nib.load(image)
+        # Load the image, only the header is needed so the voxel data is never read
+        img = nib.load(image, mmap=False)
 
-        # Get TR from image header
-        header = img.header
-        tr = header.get_zooms()[-1]
+        # Get TR and number of slices from image header
+        tr = img.header.get_zooms()[-1]
+        num_slices = img.shape[-1]
+
+        # Release the file before SPM reads it again
+        del img
 
         # Assume that slices are acquired interleaved ascending and time acquisition is '1' (you need to adjust this according to your own data)
-        time_acquisition = tr - tr/img.shape[-1]
+        time_acquisition = tr - tr/num_slices
 
         # Define SPM SliceTiming correction instance
-        st = spm.SliceTiming(in_file=image, num_slices=img.shape[-1], time_acquisition=time_acquisition, 
-                             time_repetition=tr, slice_order=list(range(1, img.shape[-1] + 1, 2)) + list(range(2, img.shape[-1] + 1, 2)))
+        st = spm.SliceTiming(in_file=image, num_slices=num_slices, time_acquisition=time_acquisition, 
+                             time_repetition=tr, slice_order=list(range(1, num_slices + 1, 2)) + list(range(2, num_slices + 1, 2)))
         try:
             st.run()
         except Exception as e:
@@ -1,4 +1,5 @@
 """Helper functions for the project."""
+import functools
 import os
 
 import itk
@@ -7,10 +8,19 @@ import numpy as np
 import SimpleITK as sitk
 
 
-def sitk_to_nib(sitk_image):
-    """Conversion from SimpleITK to Nibabel preserving spatial information."""
-    np_image = sitk.GetArrayFromImage(sitk_image)
-    np_image = np.transpose(np_image, (2, 1, 0))
+def sitk_to_nib(sitk_image, out=None):
+    """
+    Conversion from SimpleITK to Nibabel preserving spatial information.
+
+    If a preallocated (x, y, z) array is passed as ``out``, the voxels are copied
+    into it instead of a new array, and the returned image shares that buffer.
+    """
+    if out is None:
+        # Reversing the (z, y, x) array axes is a view, no extra copy is made
+        np_image = sitk.GetArrayFromImage(sitk_image).T
+    else:
+        np.copyto(out.T, sitk.GetArrayViewFromImage(sitk_image))
+        np_image = out
     origin = np.array(sitk_image.GetOrigin())
     spacing = np.array(sitk_image.GetSpacing())
     direction = np.array(sitk_image.GetDirection()).reshape((3, 3))
@@ -39,19 +49,19 @@ def nib_to_sitk(nib_image):
     SimpleITK.Image
         The converted SimpleITK image.
     """
-    data = nib_image.get_fdata()
+    # Fortran-ordered float32 data transposes into a C-contiguous view,
+    # which SimpleITK can import without an intermediate copy or cast
+    data = np.asfortranarray(nib_image.get_fdata(dtype=np.float32))
     affine = nib_image.affine
     origin = affine[:3, 3]
-    direction = affine[:3, :3].flatten()
-    spacing = np.sqrt((affine[:3, :3] ** 2).sum(axis=0))
+    spacing = np.linalg.norm(affine[:3, :3], axis=0)
+    direction = (affine[:3, :3] / spacing).flatten()
 
-    sitk_image = sitk.GetImageFromArray(np.transpose(data, (2, 1, 0)))
+    sitk_image = sitk.GetImageFromArray(data.T)
     sitk_image.SetOrigin(origin)
     sitk_image.SetSpacing(spacing)
     sitk_image.SetDirection(direction)
 
-    sitk_image = sitk.Cast(sitk_image, sitk.sitkFloat32)
-
     return sitk_image
 
 
@@ -65,7 +75,8 @@ def copy_nifti_image(image):
     Returns:
         A deep copy of the NIFTI medical image.
     """
-    data_copy = image.get_fdata().copy()
+    # Copy the proxied data directly to keep the stored dtype instead of float64
+    data_copy = np.array(image.dataobj, copy=True)
     header_copy = image.header.copy()
     image_copy = nib.Nifti1Image(data_copy, image.affine, header_copy)
 
@@ -74,11 +85,12 @@ def copy_nifti_image(image):
 
 def prepare_output_directory(output_dir, image_path):
     """Creates output directory for the given image."""
-    image_id = image_path.split("/")[-1]
-    image_id = image_id.split(".")[0]
+    image_id = os.path.basename(image_path).split(".")[0]
     new_dir = os.path.join(output_dir, image_id)
-    if os.makedirs(new_dir, exist_ok=True):
+    if os.path.isdir(new_dir):
         print("Output dir already exists.")
+    else:
+        os.makedirs(new_dir, exist_ok=True)
     return new_dir, image_id
 
 
@@ -112,7 +124,7 @@ def nib_to_itk(nib_image: nib.Nifti1Image) -> itk.image:
 
     # Extract origin, spacing, and direction from affine
     origin = affine[:3, 3]
-    spacing = np.sqrt((affine[:3, :3] ** 2).sum(axis=0))
+    spacing = np.linalg.norm(affine[:3, :3], axis=0)
     direction_matrix = affine[:3, :3] / spacing
 
     # The direction in ITK is given by the transpose of the direction matrix
@@ -158,3 +170,25 @@ def itk_to_nib(itk_image: itk.image) -> nib.Nifti1Image:
     nib_image = nib.Nifti1Image(array_data, affine)
 
     return nib_image
+
+
+def cache_per_file_version(maxsize=4):
+    """
+    Caches a single-path loader until the file at that path is modified.
+
+    The wrapped function is called as ``load(path)``. Results are kept in an
+    ``lru_cache`` keyed on the path and its modification time, so they outlive
+    the per-image step instances while still picking up edited files.
+    """
+    def decorator(load):
+        @functools.lru_cache(maxsize=maxsize)
+        def cached(path, _mtime):
+            return load(path)
+
+        @functools.wraps(load)
+        def wrapper(path):
+            return cached(path, os.path.getmtime(path))
+
+        wrapper.cache_clear = cached.cache_clear
+        return wrapper
+    return decorator
@@ -7,7 +7,6 @@ The class provides a `run` method that takes an image and returns a converted NI
 The class can be configured using a dictionary of configuration parameters.
 """
 import os
-import tempfile
 
 import dicom2nifti
 import nibabel as nib
@@ -16,6 +15,12 @@ import numpy as np
 import pydicom
 import SimpleITK as sitk
 
+# DICOM tag (0020,000E) identifying the series a file belongs to
+SERIES_INSTANCE_UID = pydicom.tag.Tag(0x0020, 0x000E)
+
+# NRRD spaces whose first two world axes point opposite to NIFTI's RAS+
+LPS_SPACES = ("left-posterior-superior", "LPS")
+
 
 class ImageConversion:
     """
@@ -25,6 +30,14 @@ class ImageConversion:
 
     def __init__(self, config):
         self.enabled = config["enabled"]
+        # Converter for each file suffix, a missing suffix means a DICOM directory
+        self.converters = {
+            ".nrrd": self._convert_nrrd_to_nifti,
+            ".dcm": self._convert_dicom_to_nifti,
+            "": self._convert_dicom_to_nifti,
+            ".nii": nib.load,
+            ".gz": nib.load,
+        }
 
     def run(self, image_path):
         """
@@ -44,53 +57,36 @@ class ImageConversion:
 
         try:
             # Check file extension
-            ext = image_path.split('.')[-1] if '.' in image_path else ''
-            if ext.lower() == 'nrrd':
-                nifti_image =  self._convert_nrrd_to_nifti(image_path)
-            elif ext.lower() in ['dcm', ''] or os.path.splitext(image_path)[0].endswith('.dcm'):
-                nifti_image = self._convert_dicom_to_nifti(image_path)
-            elif ext.lower() in ['nii', 'gz']:
-                nifti_image = nib.load(image_path)
-            else:
+            ext = os.path.splitext(image_path)[1].lower()
+            converter = self.converters.get(ext)
+            if converter is None:
                 raise ValueError(f"Unsupported image format: {ext}")
-            # Ensure the image is in the closest canonical orientation
-            nifti_image = nib.as_closest_canonical(nifti_image)
-            return nifti_image
+            nifti_image = converter(image_path)
+            # Downstream steps assume RAS+ axes, this is a no-op (and keeps the
+            # voxel data lazy) for images that are already canonical
+            return nib.as_closest_canonical(nifti_image)
         except Exception as error:
             print(f"Error converting image to NIFTI format: {str(error)}")
             raise
 
     def _convert_nrrd_to_nifti(self, image_path):
         """Convert NRRD to NIFTI format."""
-        # Read NRRD file
+        # Read NRRD file, the default Fortran index order already matches NIFTI's (i, j, k) axes
         data, header = nrrd.read(image_path)
-        
-        # Reorient to match NIFTI convention (RAS+)
+
+        # Fold the axis directions and signs into the affine instead of
+        # transposing and flipping the voxel array
         space_directions = header.get('space directions')
         if space_directions is not None:
-            # Convert to numpy array for easier manipulation
-            space_directions = np.array(space_directions)
-            
-            # Determine the primary direction of each axis
-            primary_directions = np.argmax(np.abs(space_directions), axis=1)
-            
-            # Get the signs of the primary directions
-            signs = np.sign([space_directions[i, primary_directions[i]] for i in range(3)])
-            
-            # First transpose to match NIFTI dimension order
-            data = np.transpose(data, (2, 0, 1))
-            
-            # Flip axes where needed to match RAS+ orientation
-            for i in range(3):
-                if signs[i] < 0:
-                    data = np.flip(data, axis=i)
+            affine = np.eye(4)
+            affine[:3, :3] = np.asarray(space_directions, dtype=float)[:3].T
+            affine[:3, 3] = header.get('space origin', np.zeros(3))
+            if header.get('space') in LPS_SPACES:
+                # NIFTI world coordinates are RAS+
+                affine[:2] *= -1
         else:
-            # If no space directions, just transpose to match NIFTI convention
-            data = np.transpose(data, (2, 0, 1))
-        
-        # Create affine matrix
-        spacing = header.get('spacing', (1.0, 1.0, 1.0))
-        affine = np.diag(list(spacing) + [1.0])
+            spacing = header.get('spacing', (1.0, 1.0, 1.0))
+            affine = np.diag(list(spacing) + [1.0])
         
         # Create NIFTI image
         nifti_image = nib.Nifti1Image(data, affine)
@@ -98,17 +94,38 @@ class ImageConversion:
 
     def _convert_dicom_to_nifti(self, image_path):
         """Convert DICOM to NIFTI format."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # If image_path is a directory, assume it contains DICOM series
-            if os.path.isdir(image_path):
-                dicom2nifti.convert_directory(image_path, temp_dir, reorient_nifti=True)
-            else:
-                # Single DICOM file
-                dicom_image = pydicom.dcmread(image_path)
-                dicom2nifti.convert_dicom.dicom_array_to_nifti(
-                    dicom_image, temp_dir, reorient_nifti=True
+        if os.path.isdir(image_path):
+            # Convert the largest series found in the directory
+            series = self._index_dicom_dir(image_path)
+            if not series:
+                raise ValueError(f"No DICOM files found in {image_path}")
+            series_paths = max(series.values(), key=len)
+            dicoms = (pydicom.dcmread(path, defer_size="1 KB") for path in series_paths)
+            dicom_input = [
+                dicom for dicom in dicoms if dicom2nifti.common.is_valid_imaging_dicom(dicom)
+            ]
+        else:
+            dicom_input = [pydicom.dcmread(image_path, defer_size="1 KB")]
+
+        # Converted in memory without a disk round-trip. dicom2nifti can only
+        # reorient when writing to a file, run() reorients the result instead.
+        result = dicom2nifti.convert_dicom.dicom_array_to_nifti(
+            dicom_input, None, reorient_nifti=False
+        )
+        return result["NII"]
+
+    def _index_dicom_dir(self, dir_path):
+        """Maps each SeriesInstanceUID in a directory to its sorted DICOM file paths."""
+        series = {}
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                if not entry.is_file() or not pydicom.misc.is_dicom(entry.path):
+                    continue
+                # Only the series UID is parsed, the rest of the file is skipped
+                header = pydicom.dcmread(
+                    entry.path, stop_before_pixels=True, specific_tags=[SERIES_INSTANCE_UID]
                 )
-            
-            # Load the converted NIFTI file
-            nifti_file = os.path.join(temp_dir, os.listdir(temp_dir)[0])
-            return nib.load(nifti_file)
+                series.setdefault(header.get("SeriesInstanceUID"), []).append(entry.path)
+        for paths in series.values():
+            paths.sort()
+        return series
@@ -2,14 +2,63 @@
 A module for loading medical images from DICOM, NIFTI, or NRRD files.
 """
 
+import csv
 import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 import nibabel as nib
 import nrrd
 import numpy as np
-import pandas as pd
 from pydicom import dcmread
-from pydicom.filebase import DicomBytesIO
+
+# File suffixes picked up when searching a directory for images
+IMAGE_EXTENSIONS = frozenset({".dcm", ".nii", ".gz", ".nrrd"})
+
+# Uncompressed NIFTI files above this size (1 GiB) are read without memory-mapping
+MMAP_SIZE_LIMIT = 1 << 30
+
+# Number of threads scanning subdirectories in recursive searches
+SCAN_WORKERS = 16
+
+
+class NRRDImage:
+    """Simple wrapper class to maintain consistent interface."""
+
+    def __init__(self, data, header):
+        self.data = data
+        self.header = header
+        self.shape = data.shape
+
+
+def _load_dicom(image_path):
+    print("Loading images of type: DICOM.")
+    # Large elements such as PixelData are only read from disk on access
+    return dcmread(image_path, defer_size="1 KB")
+
+
+def _load_nifti(image_path):
+    print("Loading images of type: NIFTI.")
+    # Memory-mapping very large uncompressed files is slower than plain reads
+    mmap = not (
+        image_path.lower().endswith(".nii") and os.path.getsize(image_path) > MMAP_SIZE_LIMIT
+    )
+    return nib.load(image_path, mmap=mmap)
+
+
+def _load_nrrd(image_path):
+    print("Loading images of type: NRRD.")
+    data, header = nrrd.read(image_path)
+    return NRRDImage(data, header)
+
+
+# Loader for each supported file suffix
+_LOADERS = {
+    ".dcm": _load_dicom,
+    ".nii": _load_nifti,
+    ".nii.gz": _load_nifti,
+    ".nrrd": _load_nrrd,
+}
 
 
 class ImageLoading:
@@ -21,41 +70,62 @@ class ImageLoading:
         self.file_paths = config.get("file_paths", None)
         self.recursive = config.get("recursive", False)
         self.paths = config.get("input_dir", None)
+        self.num_workers = config.get("num_workers") or os.cpu_count() or 1
+        self.scan_workers = config.get("scan_workers", SCAN_WORKERS)
 
     def run(self):
-        """Main function to load the files."""
-        image_paths = self.get_image_paths()
-
-        for image_path in image_paths:
-            try:
-                ext = image_path.split(".")[-1].lower() if "." in image_path else ""
-
-                if ext == "dcm" or image_path.lower().endswith(".dcm"):
-                    print("Loading images of type: DICOM.")
-                    with open(image_path, "rb") as file:
-                        bytesio_obj = DicomBytesIO(file.read())
-                        image = dcmread(bytesio_obj)
-                elif ext in ["nii", "gz"]:
-                    print("Loading images of type: NIFTI.")
-                    image = nib.load(image_path)
-                elif ext == "nrrd":
-                    print("Loading images of type: NRRD.")
-                    data, header = nrrd.read(image_path)
-
-                    # Simple wrapper class to maintain consistent interface
-                    class NRRDImage:
-                        def __init__(self, data, header):
-                            self.data = data
-                            self.header = header
-                            self.shape = data.shape
-
-                    image = NRRDImage(data, header)
-                else:
-                    raise ValueError(f"Unsupported file extension in file {image_path}")
+        """Main function to load the files, keeping several loads in flight."""
+        with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+            # Futures are drained in submission order so images keep the input order,
+            # and at most 2 * num_workers loaded images are held at once
+            in_flight = deque()
+            for image_path in self.get_image_paths():
+                in_flight.append(executor.submit(self._load_one, image_path))
+                if len(in_flight) >= 2 * self.num_workers:
+                    yield from self._collect(in_flight.popleft())
+            while in_flight:
+                yield from self._collect(in_flight.popleft())
+
+    def load(self, image_path, slicer=None):
+        """
+        Loads a single medical image.
 
-                yield image, image_path
-            except (IOError, RuntimeError, FileNotFoundError) as error:
-                print(f"Error loading image from {image_path}: {str(error)}")
+        Args:
+            image_path (str): Path to the image file.
+            slicer: Optional index applied to NIFTI images through their array proxy,
+                e.g. ``(..., 0)`` for the first volume of a 4D series. Only the bytes
+                of the requested subvolume are read from disk.
+
+        Returns:
+            The loaded image.
+
+        Raises:
+            ValueError: If the file extension is not supported, or a slicer is given
+                for a non-NIFTI image.
+        """
+        name = image_path.lower()
+        ext = ".nii.gz" if name.endswith(".nii.gz") else os.path.splitext(name)[1]
+        loader = _LOADERS.get(ext)
+        if loader is None:
+            raise ValueError(f"Unsupported file extension in file {image_path}")
+        if slicer is None:
+            return loader(image_path)
+        if loader is not _load_nifti:
+            raise ValueError(f"Slicing is only supported for NIFTI images, got {image_path}")
+        return loader(image_path).slicer[slicer]
+
+    def _load_one(self, image_path):
+        try:
+            return self.load(image_path), image_path
+        except (IOError, RuntimeError, FileNotFoundError) as error:
+            print(f"Error loading image from {image_path}: {str(error)}")
+            return None, image_path
+
+    @staticmethod
+    def _collect(future):
+        image, image_path = future.result()
+        if image is not None:
+            yield image, image_path
 
     def get_image_paths(self):
         """
@@ -79,9 +149,9 @@ class ImageLoading:
         if self.file_paths:
             for file_path in self.file_paths:
                 if file_path.endswith(".csv"):
-                    d_f = pd.read_csv(file_path)
-                    for image_path in d_f["image_path"].tolist():
-                        yield image_path
+                    with open(file_path, newline="", encoding="utf-8") as file:
+                        for row in csv.DictReader(file):
+                            yield row["image_path"]
                 else:
                     yield file_path
         elif self.paths:
@@ -97,14 +167,49 @@ class ImageLoading:
             raise ValueError("No valid image path or file with image paths provided.")
 
     def _get_images_from_directory(self, directory):
-        if self.recursive:
-            for root, _, files in os.walk(directory):
-                for file in files:
-                    if file.lower().endswith((".dcm", ".nii", ".gz", ".nrrd")):
-                        yield os.path.join(root, file)
+        if not self.recursive:
+            yield from _scan_directory(directory)[0]
+        elif self.scan_workers <= 1:
+            yield from self._walk_directory(directory)
         else:
-            for f in os.listdir(directory):
-                if os.path.isfile(os.path.join(directory, f)) and f.lower().endswith(
-                    (".dcm", ".nii", ".gz", ".nrrd")
+            # Subdirectories are scanned concurrently, which overlaps the
+            # latency of directory reads on network and deep filesystems
+            with ThreadPoolExecutor(max_workers=self.scan_workers) as executor:
+                yield from self._walk_concurrent(
+                    executor, executor.submit(_scan_directory, directory)
+                )
+
+    def _walk_directory(self, directory):
+        # Sequential depth-first scan, cheaper than threads on local disks
+        images, subdirs = _scan_directory(directory)
+        yield from images
+        for subdir in subdirs:
+            yield from self._walk_directory(subdir)
+
+    def _walk_concurrent(self, executor, future):
+        # Same depth-first order as _walk_directory: all subdirectories of a
+        # directory are scanned in parallel, but consumed in submission order
+        images, subdirs = future.result()
+        yield from images
+        futures = [executor.submit(_scan_directory, subdir) for subdir in subdirs]
+        for subdir_future in futures:
+            yield from self._walk_concurrent(executor, subdir_future)
+
+
+def _scan_directory(directory):
+    """Returns the image files and the subdirectories found directly in a directory."""
+    images, subdirs = [], []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                # DirEntry caches the file type, so these checks need no extra stat
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif (
+                    os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS
+                    and entry.is_file()
                 ):
-                    yield os.path.join(directory, f)
+                    images.append(entry.path)
+    except OSError as error:
+        print(f"Error scanning directory {directory}: {str(error)}")
+    return images, subdirs
@@ -1,5 +1,7 @@
 """Module for saving images to disk."""
 import os
+import shutil
+import subprocess
 
 import nibabel as nib
 
@@ -10,6 +12,11 @@ class ImageSaving:
     def __init__(self, config: dict):
         self.output_dir = config["output_dir"]
         self.input_dir = config["input_dir"]
+        # pigz compresses on all cores, nibabel's gzip writer uses a single one
+        self.pigz = shutil.which("pigz")
+        self.compression_threads = config.get("compression_threads") or os.cpu_count() or 1
+        # Output directories already created by this instance
+        self._made_dirs = set()
 
     def run(self, image, input_path):
         """Main saving function."""
@@ -22,16 +29,38 @@ class ImageSaving:
 
         # Create the same directory structure in the output directory
         output_path = os.path.join(self.output_dir, relative_path)
-        base_name = os.path.splitext(os.path.splitext(output_path)[0])[0]
+        if output_path.lower().endswith(".nii.gz"):
+            base_name = output_path[: -len(".nii.gz")]
+        else:
+            base_name = os.path.splitext(output_path)[0]
         output_path = base_name + "_pp.nii.gz"
 
-        # Make sure the output directory exists
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        # Make sure the output directory exists, once per directory
+        output_subdir = os.path.dirname(output_path)
+        if output_subdir not in self._made_dirs:
+            os.makedirs(output_subdir, exist_ok=True)
+            self._made_dirs.add(output_subdir)
 
         return output_path
 
     def _save_image(self, image, output_path):
         try:
-            nib.save(image, output_path)
-        except RuntimeError as error:
+            if self.pigz is None:
+                nib.save(image, output_path)
+                return
+
+            # Write the uncompressed file, pigz replaces it with output_path
+            uncompressed_path = output_path[: -len(".gz")]
+            nib.save(image, uncompressed_path)
+            try:
+                subprocess.run(
+                    [self.pigz, "-p", str(self.compression_threads), "-f", uncompressed_path],
+                    check=True,
+                )
+            except (OSError, subprocess.CalledProcessError):
+                # Do not leave the uncompressed intermediate behind
+                if os.path.exists(uncompressed_path):
+                    os.remove(uncompressed_path)
+                raise
+        except (RuntimeError, OSError, subprocess.CalledProcessError) as error:
             print(f"Error saving image to {output_path}: {str(error)}")
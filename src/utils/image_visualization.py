@@ -1,9 +1,23 @@
 """Visualization methods for comparing plots."""
 
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
 import matplotlib.pyplot as plt
 import nibabel as nib
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from src.utils.helper_functions import cache_per_file_version, sitk_to_nib
+
+# Pillow PNG writer options used for all saved visualizations
+PNG_SAVE_KWARGS = {"compress_level": 1, "optimize": False}
+
+# Slices larger than this many pixels along either axis are downsampled for display
+DISPLAY_MAX_PX = 512
 
-from src.utils.helper_functions import sitk_to_nib
+# Upper bound on threads used to read the slices of one visualization
+SLICE_WORKERS = 8
 
 
 class ImageVisualization:
@@ -13,61 +27,230 @@ class ImageVisualization:
     Args:
         config (int): A dictionary of configuration parameters.
             The following parameters are supported:
+            - enabled (bool): Whether visualizations are produced at all (default: True).
+            - max_subjects (int): Only the first N subjects are visualized (default: None).
             - slice_index (int): The index of the slice to visualize (default: 0).
             - output_file (str): The path to the output  visualization (default: None).
+            - backend (str): "matplotlib" to render through a figure or "pil" to
+              write the mosaic directly with Pillow (default: "matplotlib").
+            - multipage_file (str): When set, mosaics are collected into one
+              LZW-compressed multi-page TIFF written by `close` (default: None).
     """
 
     def __init__(self, config: int):
+        # A disabled visualization is one that may render zero subjects
+        self.max_subjects = config.get("max_subjects") if config.get("enabled", True) else 0
         self.output_file = config["output_file"]
+        backend = config.get("backend", "matplotlib")
+        savers = {
+            "matplotlib": self._save_matplotlib,
+            "pil": self._save_pil,
+        }
+        if backend not in savers:
+            raise ValueError(f"Unsupported visualization backend: {backend}")
+        self.save = savers[backend]
+        self.multipage_file = config.get("multipage_file")
+        self._pages = []
+        self._subjects_rendered = 0
+        self._figure = _ReusableFigure()
 
     def run(self, initial_image, template, processed_data_by_step, applied_steps):
         """
         Visualizes medical images before and after processing.
         ... [rest of the docstring remains unchanged] ...
         """
-        template = nib.load(template)
-        template = nib.as_closest_canonical(template)
+        # Diagnostics only, skip everything once disabled or past the subject limit
+        if self.max_subjects is not None and self._subjects_rendered >= self.max_subjects:
+            return
+        template_slice = _load_template_slice(template)
         if not processed_data_by_step:
             raise ValueError("No image data to visualize. 'image_data_dict' is empty.")
 
-        n_steps = len(applied_steps)
+        # Slice reads are independent proxy reads, overlap them on a thread pool
+        # and keep all matplotlib calls on this thread
+        images = [initial_image] + [processed_data_by_step[i] for i in range(len(applied_steps))]
+        with ThreadPoolExecutor(max_workers=min(SLICE_WORKERS, len(images))) as executor:
+            slices = list(executor.map(self._get_slice, images))
+
+        # Initial image and template first, then the image after each step
+        tiles = [(slices[0], "Initial Image"), (template_slice, "Template Image")] + [
+            (step_slice, f"After {step_name}")
+            for step_slice, step_name in zip(slices[1:], applied_steps)
+        ]
+        mosaic = self._build_mosaic(tiles)
+        titles = [title for _, title in tiles]
+        if self.multipage_file is not None:
+            # One report for the whole batch, encoded once in close()
+            self._pages.append(self._render_pil(mosaic, titles))
+        else:
+            self.save(mosaic, titles)
+        self._subjects_rendered += 1
+
+    def close(self):
+        """
+        Writes the buffered pages of a multi-page report and releases the figure.
+        """
+        if self._pages:
+            self._pages[0].save(
+                self.multipage_file,
+                format="TIFF",
+                save_all=True,
+                append_images=self._pages[1:],
+                compression="tiff_lzw",
+            )
+            self._pages = []
+        self._figure.close()
+
+    def _build_mosaic(self, tiles):
+        # Lay all slices out in one 2-column mosaic so the figure holds a single image
+        planes = [self._normalize_tile(self._downsample(tile).T[::-1]) for tile, _ in tiles]
+        tile_h = max(plane.shape[0] for plane in planes)
+        tile_w = max(plane.shape[1] for plane in planes)
+        gap = max(tile_h, tile_w) // 10  # room for the titles between tiles
+        cell_h, cell_w = tile_h + gap, tile_w + gap
+        # Pad every tile to a full cell (title gap on top, centred horizontally)
+        # and let np.block copy the grid in one pass. The white padding plays
+        # the figure face behind separate axes
+        cells = [self._pad_to_cell(plane, cell_h, cell_w, gap) for plane in planes]
+        if len(cells) % 2:
+            cells.append(np.full((cell_h, cell_w), 255, dtype=np.uint8))
+        title_positions = [
+            ((col + 0.5) * cell_w, row * cell_h + gap / 2)
+            for row, col in (divmod(i, 2) for i in range(len(planes)))
+        ]
+        return Mosaic(
+            np.block([cells[i:i + 2] for i in range(0, len(cells), 2)]), title_positions, gap
+        )
+
+    def _save_matplotlib(self, mosaic, titles):
+        # Render into the AGG buffer and hand the RGBA pixels straight to Pillow,
+        # skipping the savefig/print_png wrapper. Diagnostic plots are not
+        # archived, fast zlib level and no PNG filter search make encoding
+        # several times faster for a slightly larger file
+        pixels = self._figure.render(mosaic.image, titles, mosaic.title_positions)
+        Image.fromarray(pixels).save(self.output_file, format="PNG", **PNG_SAVE_KWARGS)
+
+    def _save_pil(self, mosaic, titles):
+        # The mosaic is already a grayscale uint8 image, write it at native
+        # resolution and skip the figure, AGG and savefig entirely
+        image = self._render_pil(mosaic, titles)
+        image.save(self.output_file, format="PNG", **PNG_SAVE_KWARGS)
+
+    @staticmethod
+    def _render_pil(mosaic, titles):
+        image = Image.fromarray(mosaic.image)
+        draw = ImageDraw.Draw(image)
+        # Titles are sized to the gap the mosaic leaves above each tile
+        font = ImageFont.load_default(size=max(10, mosaic.gap // 2))
+        for (x, y), title in zip(mosaic.title_positions, titles):
+            draw.text((x, y), title, fill=0, font=font, anchor="mm")
+        return image
+
+    @staticmethod
+    def _pad_to_cell(plane, cell_h, cell_w, gap):
+        left = (cell_w - plane.shape[1]) // 2
+        return np.pad(
+            plane,
+            ((gap, cell_h - gap - plane.shape[0]), (left, cell_w - left - plane.shape[1])),
+            constant_values=255,
+        )
+
+    @staticmethod
+    def _downsample(plane):
+        # The figure is only ~2000 px wide, strided slicing avoids pushing
+        # full-resolution planes through AGG and the PNG encoder
+        factor = max(1, max(plane.shape) // DISPLAY_MAX_PX)
+        return plane[::factor, ::factor]
 
-        # Create combined subplots
-        n_rows = n_steps // 2 + 1 if n_steps % 2 == 0 else n_steps // 2 + 2
-        _, axes = plt.subplots(n_rows, 2, figsize=(20, 5 * n_rows), squeeze=False)
+    @staticmethod
+    def _normalize_tile(plane):
+        # Each slice keeps its own contrast, as with separate imshow calls, and is
+        # scaled to uint8 once so AGG gets 8-bit data without a float Normalize pass
+        plane_min = plane.min()
+        value_range = max(float(plane.max() - plane_min), 1e-12)
+        return ((plane - plane_min) * (255.0 / value_range)).astype(np.uint8)
 
-        # Display initial image and template
-        axes[0, 0].imshow(self._get_slice(initial_image).T, cmap="gray", origin="lower")
-        axes[0, 0].set_title("Initial Image")
-        axes[0, 1].imshow(self._get_slice(template).T, cmap="gray", origin="lower")
-        axes[0, 1].set_title("Template Image")
+    @staticmethod
+    def _get_slice(image):
+        return get_midplane_slice(image)
 
-        # Display images after each preprocessing step
-        for i, step_name in enumerate(applied_steps):
-            image_after = processed_data_by_step[i]
-            slice_after = self._get_slice(image_after)
 
-            # Calculate row and column index
-            row = (i // 2) + 1  # Incremented by 1 to account for the initial row
-            col = i % 2
+class Mosaic(NamedTuple):
+    """A uint8 tile mosaic with the centre of each tile's title and the title gap in pixels."""
 
-            # The 'After [step]' image in the respective column
-            axes[row, col].imshow(slice_after.T, cmap="gray", origin="lower")
-            axes[row, col].set_title(f"After {step_name}")
+    image: np.ndarray
+    title_positions: list
+    gap: int
 
-        plt.tight_layout()
-        plt.savefig(self.output_file)
 
-    def _get_slice(self, image):
-        z_midpoint = image.shape[2] // 2
-        if isinstance(image, nib.nifti1.Nifti1Image):
-            return image.get_fdata()[:, :, z_midpoint]
+class _ReusableFigure:
+    """Matplotlib figure kept across runs while the mosaic layout stays the same."""
+
+    def __init__(self):
+        self._figure = None
+        self._axes_image = None
+        self._titles = []
+        self._layout = None
+
+    def render(self, mosaic, titles, title_positions):
+        """Draws the mosaic with its titles and returns the RGBA pixels."""
+        # Batch runs mostly repeat the same layout, so the figure is built once
+        # and later runs only swap the image data and the title strings
+        layout = (mosaic.shape, tuple(title_positions))
+        if self._figure is None or self._layout != layout:
+            self._build(mosaic, title_positions, (len(titles) + 1) // 2)
+            self._layout = layout
         else:
-            try:
-                nib_image = sitk_to_nib(image)
-                return nib_image.get_fdata()[:, :, z_midpoint]
-            except TypeError:
-                print(
-                    "Unsupported image type. Currently only nibabel.nifti1.Nifti1Image"
-                    "and Sikt conversion is supported."
-                )
+            self._axes_image.set_data(mosaic)
+        for text, title in zip(self._titles, titles):
+            text.set_text(title)
+        self._figure.canvas.draw()
+        return np.asarray(self._figure.canvas.buffer_rgba())
+
+    def close(self):
+        """Closes the figure, the next render builds a new one."""
+        if self._figure is not None:
+            plt.close(self._figure)
+            self._figure = None
+            self._layout = None
+
+    def _build(self, mosaic, title_positions, n_rows):
+        self.close()
+        fig, ax = plt.subplots(figsize=(20, 5 * n_rows))
+        self._axes_image = ax.imshow(mosaic, cmap="gray", vmin=0, vmax=255)
+        self._titles = [ax.text(x, y, "", ha="center", va="center") for x, y in title_positions]
+        ax.set_axis_off()
+        # Fixed margins instead of tight_layout, which re-solves the layout on every save
+        fig.subplots_adjust(left=0.01, right=0.99, top=0.99, bottom=0.01)
+        self._figure = fig
+
+
+def get_midplane_slice(image):
+    """Axial midplane of a NIfTI or SimpleITK image in RAS+ orientation, as float32."""
+    if isinstance(image, nib.nifti1.Nifti1Image):
+        return _slice_nifti(image)
+    return _slice_sitk(image)
+
+
+def _slice_nifti(image):
+    # Axial slices need RAS+ axes, this is a no-op for canonical images
+    image = nib.as_closest_canonical(image)
+    # Slicing the array proxy reads only this plane from disk, for 4D series
+    # only from the first volume
+    return np.asarray(image.dataobj[_plane_index(image.shape)], dtype=np.float32)
+
+
+def _slice_sitk(image):
+    # Converted first (SimpleITK images have no .shape) and reoriented like NIfTI tiles
+    return _slice_nifti(sitk_to_nib(image))
+
+
+def _plane_index(shape):
+    # Axial midplane, first index of any extra axes
+    return (slice(None), slice(None), shape[2] // 2) + (0,) * (len(shape) - 3)
+
+
+@cache_per_file_version(maxsize=4)
+def _load_template_slice(template_path: str):
+    """Midplane slice of a template image, cached per file version."""
+    return get_midplane_slice(nib.load(template_path))
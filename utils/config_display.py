@@ -2,11 +2,19 @@ import streamlit as st
 
 def display_config_tree(config_data, indent=0):
     """Helper function to display config in a tree-like structure"""
+    # One markdown block for the whole tree instead of a Streamlit call per key
+    lines = []
+    _walk(config_data, indent, lines)
+    if lines:
+        st.markdown("\n\n".join(lines))
+
+def _walk(config_data, indent, lines):
+    """Collects the markdown lines of the config tree"""
     for key, value in config_data.items():
         if key == "display_step":
             continue
         if isinstance(value, dict):
-            st.markdown("&nbsp;" * indent + f"**{key}:**")
-            display_config_tree(value, indent + 2)
+            lines.append("&nbsp;" * indent + f"**{key}:**")
+            _walk(value, indent + 2, lines)
         else:
-            st.markdown("&nbsp;" * indent + f"**{key}:** {value}") 
\ No newline at end of file
+            lines.append("&nbsp;" * indent + f"**{key}:** {value}")
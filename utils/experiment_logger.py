@@ -1,4 +1,5 @@
 import json
+import os
 from pathlib import Path
 from datetime import datetime
 import streamlit as st
@@ -7,23 +8,25 @@ def save_experiment_log(experiment_data):
     log_dir = Path("experiment_logs")
     log_dir.mkdir(exist_ok=True)
 
-    # Ensure all data is JSON serializable
-    serializable_data = {}
-    for key, value in experiment_data.items():
-        if isinstance(value, Path):
-            serializable_data[key] = str(value)
-        elif isinstance(value, (dict, list, str, int, float, bool, type(None))):
-            serializable_data[key] = value
-        else:
-            serializable_data[key] = str(value)
-
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"experiment_{timestamp}_{serializable_data['experiment_name']}.json"
+    filename = f"experiment_{timestamp}_{experiment_data['experiment_name']}.json"
 
+    # Write to a temporary file in the same directory and rename it into place,
+    # so an interrupted save never leaves a truncated log behind. os.open with
+    # mode 0o666 lets the umask decide the final permissions, as open() would
+    tmp_path = log_dir / f".{filename}.tmp"
+    created = False
     try:
-        with open(log_dir / filename, "w") as f:
-            json.dump(serializable_data, f, indent=4)
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        created = True
+        with os.fdopen(fd, "w", buffering=1 << 20, encoding="utf-8") as f:
+            # Non-serializable values such as Paths are written as their str()
+            json.dump(experiment_data, f, indent=4, default=str)
+        os.replace(tmp_path, log_dir / filename)
     except Exception as e:
+        # Only clean up a temporary file this call created
+        if created and os.path.exists(tmp_path):
+            os.remove(tmp_path)
         st.error(f"Error saving experiment log: {str(e)}")
         return False
     